@@ -1,10 +1,17 @@
+import itertools
 import random
+import re
 import aiohttp
 import asyncio
-from fastapi import FastAPI, HTTPException
+import orjson
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import logging
+import time
 from datetime import datetime
 from typing import List, Dict, Any, Union
 
@@ -24,7 +31,55 @@ logger.addHandler(stream_handler)
 logger.propagate = False
 
 
-app = FastAPI(title="Amazon Scraper API", description="An API to scrape Amazon product data and reviews.")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manages a single ClientSession for the app's lifetime.
+
+    Reusing one session keeps aiohttp's connection pool (and the TLS
+    handshakes already paid for) warm across /scrape calls instead of
+    rebuilding it on every request. The session also caches responses on
+    disk with a short TTL, so a repeat ASIN within 10 minutes is served
+    in microseconds instead of a round trip to Amazon.
+
+    A process-wide work queue and fixed worker pool fan out the scraping,
+    so concurrent /scrape requests share one bounded set of workers
+    instead of each spinning up its own competing task pool.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=1024,
+        limit_per_host=64,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True,
+    )
+    app.state.session = CachedSession(
+        cache=SQLiteBackend("amazon_cache", expire_after=600, allowed_codes=(200,)),
+        connector=connector,
+    )
+    app.state.queue = asyncio.Queue()
+    app.state.workers = [
+        asyncio.create_task(scrape_worker(app.state.session, app.state.queue))
+        for _ in range(SCRAPE_WORKERS)
+    ]
+    logger.info("Shared aiohttp ClientSession and %d scrape workers created.", SCRAPE_WORKERS)
+    yield
+    for worker in app.state.workers:
+        worker.cancel()
+    # Wait for the cancellations to land before closing the session a worker
+    # mid-scrape may still be using
+    await asyncio.gather(*app.state.workers, return_exceptions=True)
+    await app.state.session.close()
+    logger.info("Shared aiohttp ClientSession closed.")
+
+
+# ORJSONResponse serializes the large /scrape result arrays in C, several
+# times faster than the stdlib json encoder used by the default JSONResponse
+app = FastAPI(
+    title="Amazon Scraper API",
+    description="An API to scrape Amazon product data and reviews.",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 # --- Step 2: Pydantic Models for Type Safety ---
@@ -33,183 +88,347 @@ class ScrapeRequest(BaseModel):
     country_code: str = "com.au"
 
 
+# Hard cap on concurrent in-flight requests to amazon.*; bounds both the
+# rate-limit exposure and the memory held by response buffers.
+AMAZON_SEM = asyncio.BoundedSemaphore(16)
+
+# Per-phase timeout budgets: a hung TCP connect or stalled read fails fast and
+# frees its slot instead of eating the whole total budget (long-tail latency)
+_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5, sock_connect=5, sock_read=10)
+
+# Precompiled patterns for the hot string munging: digit runs in review counts
+# like "12,345 global ratings" and the leading number in "4.3 out of 5 stars"
+_DIGITS_RE = re.compile(r"\d+")
+_LEADING_FLOAT_RE = re.compile(r"[\d.]+")
+
+# schema.org Product blocks embedded in the page; pulling two numbers out of a
+# small JSON blob is far cheaper than building a DOM and running CSS selectors
+_LDJSON_RE = re.compile(rb'<script type="application/ld\+json">(.*?)</script>', re.DOTALL)
+
+# CSS selectors hoisted to named constants: defined once, and a single place
+# to update if the markup (or the parser) changes
+_SEL_RATING = "#acrPopover span.a-icon-alt"
+_SEL_REVIEW_COUNT = "#acrCustomerReviewText"
+_SEL_REVIEW_BOXES = 'div[data-hook="review"]'
+_SEL_STAR = '[data-hook="review-star-rating"]'
+_SEL_REVIEW_BODY = '[data-hook="review-body"]'
+_SEL_REVIEW_DATE = '[data-hook="review-date"]'
+
+
+def strain_to_fragment(raw: bytes, marker: bytes, before: int = 4096, after: int = 4096) -> bytes:
+    """Returns the slice of `raw` surrounding `marker`, or all of `raw` if absent.
+
+    Amazon product pages run to multiple MB, but the elements we consume sit in
+    a small fragment. Parsing only a window around that fragment is the
+    SoupStrainer-style trick for cutting parse time on big pages.
+    """
+    idx = raw.find(marker)
+    if idx == -1:
+        return raw
+    return raw[max(0, idx - before):idx + after]
+
+
+# Amazon serves Brotli-compressed bodies (15-25% smaller than gzip) when we
+# advertise `br`; aiohttp only decodes them if a brotli module is importable,
+# so don't advertise what we can't decode.
+try:
+    import brotli  # noqa: F401  (imported for aiohttp's auto-decompression)
+    _BROTLI_AVAILABLE = True
+except ImportError:
+    _BROTLI_AVAILABLE = False
+    logger.warning("brotli is not installed; falling back to gzip/deflate Accept-Encoding.")
+
+
 # --- Step 3: Headers and Proxies ---
 # Using a pool of user agents to mimic different browsers and reduce block rate.
+# Both the pool and the constant header fields are built once at import time so
+# get_headers() only pays for one dict merge per call.
+_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/118.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36",
+)
+
+# Round-robin rotation guarantees uniform UA diversity within a burst, which
+# random.choice does not (it tends to repeat); no lock needed since all
+# coroutines share one event loop
+_UA_CYCLE = itertools.cycle(_USER_AGENTS)
+
+_BASE_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br" if _BROTLI_AVAILABLE else "gzip, deflate",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "DNT": "1", # Do Not Track request header
+}
+
+
 def get_headers() -> Dict[str, str]:
     """Returns a dictionary of headers to mimic a real browser request."""
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/118.0",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36",
-    ]
-    return {
-        "User-Agent": random.choice(user_agents),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "DNT": "1", # Do Not Track request header
-    }
+    return _BASE_HEADERS | {"User-Agent": next(_UA_CYCLE)}
 
 
 # --- Step 4: Core Scraping Functions ---
-async def scrape_product_data(session: aiohttp.ClientSession, asin: str, country_code: str) -> Dict[str, Any]:
+async def scrape_product_data(session: CachedSession, asin: str, country_code: str) -> Dict[str, Any]:
     """Scrapes the main product page for rating and total review count."""
     url = f"https://www.amazon.{country_code}/dp/{asin}?th=1&psc=1"
     data = {"asin": asin, "country_code": country_code, "url": url}
-    logger.info(f"Scraping product data for ASIN {asin} from URL: {url}")
+    logger.info("Scraping product data for ASIN %s from URL: %s", asin, url)
+
+    # A cache hit skips the anti-burst jitter, but still takes a semaphore
+    # slot: has_url does not check expiry, so a stale "hit" may refetch from
+    # the network, and a slot is nearly free when the body comes from cache
+    if not await session.cache.has_url(url):
+        # Jitter inside the coroutine spreads requests out without serializing task launch
+        await asyncio.sleep(random.uniform(0, 0.5))
 
     try:
-        async with session.get(url, headers=get_headers(), timeout=15) as response:
-            response_text = await response.text()
+        async with AMAZON_SEM, session.get(url, headers=get_headers(), timeout=_TIMEOUT) as response:
+            # Keep the body as bytes: Lexbor parses bytes directly, so there is
+            # no need to materialize a second full-page Python str via .text()
+            raw = await response.read()
             if response.status != 200:
-                logger.error(f"Failed to fetch {asin}. Status: {response.status}. URL: {url}")
-                # Log the response body to understand what Amazon is sending (e.g., CAPTCHA)
-                logger.debug(f"Response body for failed request ({asin}):\n{response_text[:1000]}")
+                logger.error("Failed to fetch %s. Status: %s. URL: %s", asin, response.status, url)
+                # Log the response body to understand what Amazon is sending (e.g., CAPTCHA);
+                # only decode the slice when DEBUG is actually enabled
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Response body for failed request (%s):\n%s", asin, raw[:1000].decode("utf-8", errors="replace"))
                 return {**data, "error": f"HTTP {response.status}"}
 
             # Check for CAPTCHA in the page title or body, a common anti-scraping technique
-            if "captcha" in response_text.lower() or "api-services-support@amazon.com" in response_text.lower():
-                logger.warning(f"CAPTCHA detected for ASIN {asin}. URL: {url}")
+            if b"captcha" in raw.lower() or b"api-services-support@amazon.com" in raw:
+                logger.warning("CAPTCHA detected for ASIN %s. URL: %s", asin, url)
+                # Block pages arrive with HTTP 200, so allowed_codes doesn't keep
+                # them out of the cache; evict so the block isn't replayed all TTL
+                await session.cache.delete_url(url)
                 return {**data, "error": "CAPTCHA or block page detected"}
 
-            soup = BeautifulSoup(response_text, "lxml")
+            # Fast path: Amazon embeds a schema.org Product JSON-LD block with
+            # the aggregate rating, which avoids building a DOM at all
+            for match in _LDJSON_RE.finditer(raw):
+                try:
+                    obj = orjson.loads(match.group(1))
+                except orjson.JSONDecodeError:
+                    continue
+                rating_info = obj.get("aggregateRating") if isinstance(obj, dict) and obj.get("@type") == "Product" else None
+                if rating_info:
+                    rating_value = rating_info.get("ratingValue")
+                    review_count = rating_info.get("reviewCount")
+                    if rating_value is None or review_count is None:
+                        # Incomplete block; let the CSS fallback handle the page
+                        continue
+                    data["rating"] = float(rating_value)
+                    data["review_count"] = int(review_count)
+                    logger.info("Successfully scraped product data for %s from JSON-LD.", asin)
+                    return data
+
+            # Fallback: both selectors live in the review-summary fragment, so
+            # only parse a small window around it instead of the whole multi-MB page
+            tree = LexborHTMLParser(strain_to_fragment(raw, b'id="acrPopover"'))
 
             # Safely extract rating
-            rating_element = soup.select_one("#acrPopover span.a-icon-alt")
-            data["rating"] = float(rating_element.text.split()[0]) if rating_element else None
+            rating_element = tree.css_first(_SEL_RATING)
+            data["rating"] = float(_LEADING_FLOAT_RE.match(rating_element.text().strip()).group()) if rating_element else None
 
             # Safely extract total review count
-            review_count_element = soup.select_one("#acrCustomerReviewText")
+            review_count_element = tree.css_first(_SEL_REVIEW_COUNT)
             data["review_count"] = (
-                int("".join(filter(str.isdigit, review_count_element.text)))
+                int("".join(_DIGITS_RE.findall(review_count_element.text())))
                 if review_count_element
                 else None
             )
             
-            logger.info(f"Successfully scraped product data for {asin}.")
+            logger.info("Successfully scraped product data for %s.", asin)
             return data
 
     except asyncio.TimeoutError:
-        logger.error(f"Timeout error scraping product {asin} from {url}")
+        logger.error("Timeout error scraping product %s from %s", asin, url)
         return {**data, "error": "Request timed out"}
     except Exception as e:
-        logger.error(f"An unexpected error occurred while scraping product {asin}: {e}", exc_info=True)
+        logger.error("An unexpected error occurred while scraping product %s: %s", asin, e, exc_info=True)
         return {**data, "error": str(e)}
 
 
-async def scrape_negative_reviews(session: aiohttp.ClientSession, asin: str, country_code: str) -> List[Dict[str, Any]]:
-    """Scrapes the most recent critical reviews for a product."""
+async def _fetch_review_page(session: CachedSession, asin: str, country_code: str, page: int) -> List[Dict[str, Any]]:
+    """Fetches and parses a single page of critical reviews."""
     url = f"https://www.amazon.{country_code}/product-reviews/{asin}/"
     reviews: List[Dict[str, Any]] = []
-    logger.info(f"Scraping negative reviews for ASIN {asin}")
 
     params = {
         "ie": "UTF8",
         "reviewerType": "all_reviews",
         "filterByStar": "critical", # 1, 2, and 3-star reviews
-        "pageNumber": 1,
+        "pageNumber": page,
         "sortBy": "recent"
     }
 
+    # A cache hit skips the anti-burst jitter, but still takes a semaphore
+    # slot; see the matching check in scrape_product_data
+    if not await session.cache.has_url(url, params=params):
+        # Jitter inside the coroutine spreads requests out without serializing task launch
+        await asyncio.sleep(random.uniform(0, 0.5))
+
     try:
-        async with session.get(url, headers=get_headers(), params=params, timeout=15) as response:
-            response_text = await response.text()
+        async with AMAZON_SEM, session.get(url, headers=get_headers(), params=params, timeout=_TIMEOUT) as response:
+            # Keep the body as bytes; Lexbor parses bytes directly (see scrape_product_data)
+            raw = await response.read()
             if response.status != 200:
-                logger.warning(f"Failed to fetch reviews for {asin}. Status: {response.status}. URL: {response.url}")
-                logger.debug(f"Response body for failed review request ({asin}):\n{response_text[:1000]}")
+                logger.warning("Failed to fetch reviews for %s. Status: %s. URL: %s", asin, response.status, response.url)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Response body for failed review request (%s):\n%s", asin, raw[:1000].decode("utf-8", errors="replace"))
                 return reviews # Return empty list on failure
 
-            soup = BeautifulSoup(response_text, "lxml")
-            review_elements = soup.select('div[data-hook="review"]')
-            logger.info(f"Found {len(review_elements)} review elements for {asin}.")
+            # Check for CAPTCHA as in scrape_product_data; block pages come with
+            # HTTP 200, so evict the cache entry or it would be replayed all TTL
+            if b"captcha" in raw.lower() or b"api-services-support@amazon.com" in raw:
+                logger.warning("CAPTCHA detected for review request %s (page %d). URL: %s", asin, page, url)
+                await session.cache.delete_url(url, params=params)
+                return reviews
+
+            # Skip everything above the review list; the reviews run to the end
+            # of the document, so keep the rest of the buffer from there on
+            tree = LexborHTMLParser(strain_to_fragment(raw, b'id="cm_cr-review_list"', before=1024, after=len(raw)))
+            review_elements = tree.css(_SEL_REVIEW_BOXES)
+            logger.info("Found %d review elements for %s (page %d).", len(review_elements), asin, page)
 
             for box in review_elements:
                 try:
-                    # Use .get_text() with strip=True for cleaner text extraction
-                    star_text = box.select_one('[data-hook="review-star-rating"]').get_text(strip=True)
-                    review_body = box.select_one('[data-hook="review-body"]').get_text(strip=True)
-                    date_text = box.select_one('[data-hook="review-date"]').get_text(strip=True)
+                    # Use .text(deep=True) with strip for cleaner text extraction
+                    star_text = box.css_first(_SEL_STAR).text(deep=True).strip()
+                    review_body = box.css_first(_SEL_REVIEW_BODY).text(deep=True).strip()
+                    date_text = box.css_first(_SEL_REVIEW_DATE).text(deep=True).strip()
                     
                     reviews.append({
-                        "star": float(star_text.split()[0]),
+                        "star": float(_LEADING_FLOAT_RE.match(star_text).group()),
                         "review": review_body,
                         "date": date_text
                     })
                 except Exception as e:
                     # Log if a specific review box fails to parse, but continue with others
-                    logger.warning(f"Could not parse a review for {asin}. Error: {e}", exc_info=False)
+                    logger.warning("Could not parse a review for %s. Error: %s", asin, e, exc_info=False)
                     continue
-        
-        logger.info(f"Successfully scraped {len(reviews)} negative reviews for {asin}.")
+
         return reviews
-        
+
     except asyncio.TimeoutError:
-        logger.error(f"Timeout error scraping reviews for {asin} from {url}")
+        logger.error("Timeout error scraping reviews for %s (page %d) from %s", asin, page, url)
         return reviews
     except Exception as e:
-        logger.error(f"An unexpected error occurred while scraping reviews for {asin}: {e}", exc_info=True)
+        logger.error("An unexpected error occurred while scraping reviews for %s (page %d): %s", asin, page, e, exc_info=True)
         return reviews
 
 
+async def scrape_negative_reviews(session: CachedSession, asin: str, country_code: str, pages: int = 1) -> List[Dict[str, Any]]:
+    """Scrapes the most recent critical reviews for a product.
+
+    All requested pages are fetched concurrently; with the shared keep-alive
+    session each extra page costs only an HTTP round trip, not a TLS setup.
+    """
+    logger.info("Scraping negative reviews for ASIN %s (%d page(s))", asin, pages)
+    page_results = await asyncio.gather(
+        *[_fetch_review_page(session, asin, country_code, page) for page in range(1, pages + 1)],
+        return_exceptions=True,
+    )
+
+    reviews: List[Dict[str, Any]] = []
+    for result in page_results:
+        if isinstance(result, Exception):
+            logger.error("Review page fetch for %s failed with an exception: %s", asin, result)
+            continue
+        reviews.extend(result)
+
+    logger.info("Successfully scraped %d negative reviews for %s.", len(reviews), asin)
+    return reviews
+
+
 # --- Step 5: Concurrent Processing Logic ---
-async def process_asins(asins: List[str], country_code: str) -> List[Dict[str, Any]]:
-    """Processes a list of ASINs concurrently, scraping data and reviews."""
-    logger.info(f"Starting to process {len(asins)} ASINs for country '{country_code}'.")
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for asin in asins:
-            # Create tasks for both product data and reviews for each ASIN
-            tasks.append(scrape_product_data(session, asin, country_code))
-            tasks.append(scrape_negative_reviews(session, asin, country_code))
-            # A small, random delay between creating tasks can help avoid rate-limiting
-            await asyncio.sleep(random.uniform(0.1, 0.3))
-        
-        # return_exceptions=True ensures that if one task fails, others can still complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        logger.debug(f"Raw results from asyncio.gather: {results}")
-
-        # Combine product data and reviews
-        combined_results = []
-        for i in range(0, len(results), 2):
-            product_data = results[i]
-            reviews = results[i+1] if i + 1 < len(results) else []
-
-            # Handle exceptions returned by asyncio.gather
-            if isinstance(product_data, Exception):
-                logger.error(f"Task for product data failed with an exception: {product_data}")
-                continue # Skip this ASIN
-            if isinstance(reviews, Exception):
-                logger.error(f"Task for reviews failed with an exception: {reviews}")
-                reviews = [] # Default to empty list if review scraping failed
-
-            # Check for errors captured within the scraping function (e.g., HTTP 500)
-            if product_data.get("error"):
-                logger.warning(f"Skipping ASIN {product_data.get('asin', 'unknown')} due to error: {product_data['error']}")
-            else:
-                product_data["negative_reviews"] = reviews
-                product_data["negative_review_count"] = len(reviews)
-                combined_results.append(product_data)
-
-        logger.info(f"Finished processing. Successfully combined data for {len(combined_results)} ASINs.")
-        return combined_results
+# Size of the process-wide worker pool. All /scrape requests share these
+# workers, so overall pressure on amazon.* stays bounded no matter how many
+# requests are in flight.
+SCRAPE_WORKERS = 64
+
+
+async def scrape_worker(session: CachedSession, queue: asyncio.Queue) -> None:
+    """Consumes (future, asin, country_code) jobs from the shared scrape queue."""
+    while True:
+        future, asin, country_code = await queue.get()
+        try:
+            result = await scrape_one(session, asin, country_code)
+            # The submitter may have been cancelled mid-job (client disconnect,
+            # shutdown); its future is then already done and set_result would
+            # raise InvalidStateError and kill the worker, so discard instead
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            queue.task_done()
+
+
+async def scrape_one(session: CachedSession, asin: str, country_code: str) -> Dict[str, Any]:
+    """Scrapes product data and reviews for a single ASIN concurrently.
+
+    Always returns a dict; unexpected exceptions are captured under "error"
+    so callers never have to branch on exception instances.
+    """
+    try:
+        product_data, reviews = await asyncio.gather(
+            scrape_product_data(session, asin, country_code),
+            scrape_negative_reviews(session, asin, country_code),
+        )
+    except Exception as e:
+        logger.error("Scraping ASIN %s failed with an exception: %s", asin, e, exc_info=True)
+        return {"asin": asin, "country_code": country_code, "error": repr(e)}
+
+    product_data["negative_reviews"] = reviews
+    product_data["negative_review_count"] = len(reviews)
+    return product_data
+
+
+async def process_asins(queue: asyncio.Queue, asins: List[str], country_code: str) -> List[Dict[str, Any]]:
+    """Processes a list of ASINs through the shared worker pool."""
+    logger.info("Starting to process %d ASINs for country '%s'.", len(asins), country_code)
+    loop = asyncio.get_running_loop()
+    futures = []
+    for asin in asins:
+        future = loop.create_future()
+        queue.put_nowait((future, asin, country_code))
+        futures.append(future)
+    results = await asyncio.gather(*futures)
+    # Gate: the f-string would stringify every review dict even when DEBUG is off
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Raw results from worker pool: %s", results)
+
+    # scrape_one guarantees dicts, so filtering out failures is a single check
+    combined_results = []
+    for product_data in results:
+        if product_data.get("error"):
+            logger.warning("Skipping ASIN %s due to error: %s", product_data.get("asin", "unknown"), product_data["error"])
+        else:
+            combined_results.append(product_data)
+
+    logger.info("Finished processing. Successfully combined data for %d ASINs.", len(combined_results))
+    return combined_results
 
 
 # --- Step 6: API Endpoints ---
 @app.post("/scrape", summary="Scrape Amazon product data for a list of ASINs")
-async def scrape_endpoint(request: ScrapeRequest):
+async def scrape_endpoint(request: ScrapeRequest, http_request: Request):
     """
     Accepts a list of ASINs and a country code, then scrapes Amazon for product data and recent negative reviews.
     """
-    start_time = datetime.now()
-    logger.info(f"Received scrape request for ASINs: {request.asins} in country: {request.country_code}")
-    
+    # perf_counter is monotonic, so the reported duration can't go negative
+    # when the system clock is adjusted mid-request
+    start_time = time.perf_counter()
+    logger.info("Received scrape request for ASINs: %s in country: %s", request.asins, request.country_code)
+
     try:
-        results = await process_asins(request.asins, request.country_code)
-        duration = (datetime.now() - start_time).total_seconds()
-        logger.info(f"Scraping completed in {duration:.2f} seconds.")
+        results = await process_asins(http_request.app.state.queue, request.asins, request.country_code)
+        duration = time.perf_counter() - start_time
+        logger.info("Scraping completed in %.2f seconds.", duration)
         return {
             "status": "success",
             "duration_seconds": duration,
@@ -217,7 +436,7 @@ async def scrape_endpoint(request: ScrapeRequest):
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
-        logger.critical(f"A critical error occurred in the scrape endpoint: {e}", exc_info=True)
+        logger.critical("A critical error occurred in the scrape endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"An internal server error occurred: {str(e)}")
 
 
@@ -231,4 +450,6 @@ async def health_check():
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting Uvicorn server for local development.")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools replace the stdlib event loop / h11 parser with
+    # C implementations; uvicorn also auto-selects them when installed
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")